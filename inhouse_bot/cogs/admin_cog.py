@@ -1,4 +1,4 @@
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 import discord
 from discord.ext import commands
@@ -18,7 +18,6 @@ from inhouse_bot.common_utils.lol_api.tasks import get_summoner_by_name
 from inhouse_bot.common_utils.set_player_summoner_puuid import set_player_summoner
 from inhouse_bot.database_orm import session_scope
 from inhouse_bot.database_orm.tables.player import Player
-from inhouse_bot.inhouse_bot import InhouseBot
 from inhouse_bot.queue_channel_handler.queue_channel_handler import (
     queue_channel_handler,
 )
@@ -29,13 +28,16 @@ from inhouse_bot.voice_channel_handler.voice_channel_handler import (
     remove_voice_channels,
 )
 
+if TYPE_CHECKING:
+    from inhouse_bot.inhouse_bot import InhouseBot
+
 
 class AdminCog(commands.Cog, name="Admin"):
     """
     Reset queues and manages games
     """
 
-    def __init__(self, bot: InhouseBot):
+    def __init__(self, bot: "InhouseBot"):
         self.bot = bot
 
         # players may use the Tournament feature incorrectly and need to score their games manually
@@ -3,6 +3,7 @@ import discord
 import random
 
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 from discord.ext import commands
 
 from inhouse_bot import game_queue
@@ -25,7 +26,6 @@ from inhouse_bot.common_utils.is_verified_user import are_verified_users
 from inhouse_bot.database_orm import session_scope
 from inhouse_bot.database_orm.tables.game import Game
 from inhouse_bot.database_orm.tables.tournament import Tournament
-from inhouse_bot.inhouse_bot import InhouseBot
 from inhouse_bot.queue_channel_handler.queue_channel_handler import (
     queue_channel_handler,
     queue_channel_only,
@@ -39,13 +39,16 @@ from inhouse_bot.voice_channel_handler.voice_channel_handler import (
     remove_voice_channels,
 )
 
+if TYPE_CHECKING:
+    from inhouse_bot.inhouse_bot import InhouseBot
+
 
 class QueueCog(commands.Cog, name="Queue"):
     """
     Manage your queue status and score games
     """
 
-    def __init__(self, bot: InhouseBot):
+    def __init__(self, bot: "InhouseBot"):
         self.bot = bot
 
         # Makes them jump ahead on the next queue
@@ -1,6 +1,7 @@
 from pydoc import describe
 from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 import dateparser
 import discord
@@ -32,7 +33,6 @@ from inhouse_bot.database_orm import (
 from inhouse_bot.common_utils.fields import ChampionNameConverter, RoleConverter
 from inhouse_bot.common_utils.get_last_game import get_last_game
 
-from inhouse_bot.inhouse_bot import InhouseBot
 from inhouse_bot.ranking_channel_handler.ranking_channel_handler import (
     ranking_channel_handler,
 )
@@ -40,6 +40,9 @@ from inhouse_bot.stats_menus.history_pages import HistoryPagesSource
 from inhouse_bot.stats_menus.ranking_pages import RankingPagesSource
 
 
+if TYPE_CHECKING:
+    from inhouse_bot.inhouse_bot import InhouseBot
+
 matplotlib.use("Agg")
 plt.style.use("cyberpunk")
 
@@ -49,7 +52,7 @@ class StatsCog(commands.Cog, name="Stats"):
     Display game-related statistics
     """
 
-    def __init__(self, bot: InhouseBot):
+    def __init__(self, bot: "InhouseBot"):
         self.bot = bot
 
     @commands.command()
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+# Fastest flush rate, used when updates are rarely requested (30 per second)
+MIN_INTERVAL = 1 / 30
+
+# Slowest flush rate, used when updates are requested in bursts (1 per second)
+MAX_INTERVAL = 1.0
+
+# Number of additional update requests per RATE_WINDOW seconds at which we reach MAX_INTERVAL
+MAX_RATE = 10
+RATE_WINDOW = 1.0
+
+
+class BatchedUpdateAggregator:
+    """
+    Coalesces update requests made in a short interval into a single update per key
+
+    Requests for a key that is already pending replace its payload (or get merged with it if a merge function
+    is supplied), and all pending updates are flushed once the interval has passed. The interval grows
+    quadratically with the recent request rate, going from MIN_INTERVAL to MAX_INTERVAL.
+
+    Keys are flushed concurrently, and each request gets the future of its own key, which holds the
+    exception raised by the flush if it failed.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Hashable, Any], Awaitable[None]],
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+    ):
+        self._flush = flush
+        self._merge = merge
+
+        # key -> latest payload
+        self.pending: Dict[Hashable, Any] = {}
+
+        # key -> future resolved once the pending update for this key is flushed
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Timestamps of the recent update requests, used to compute the interval
+        self._triggers: Deque[float] = deque()
+
+    @property
+    def interval(self) -> float:
+        now = time.monotonic()
+
+        while self._triggers and now - self._triggers[0] > RATE_WINDOW:
+            self._triggers.popleft()
+
+        # A lone request is not a burst, so only the requests made on top of it add load
+        load = min(max(len(self._triggers) - 1, 0) / MAX_RATE, 1)
+
+        return MIN_INTERVAL + (MAX_INTERVAL - MIN_INTERVAL) * load**2
+
+    def schedule(self, key: Hashable, payload: Any) -> asyncio.Future:
+        """
+        Adds an update to the next flush and returns the future resolved once this key is flushed
+        """
+        return self.schedule_many([(key, payload)])[key]
+
+    def schedule_many(
+        self, updates: Iterable[Tuple[Hashable, Any]]
+    ) -> Dict[Hashable, asyncio.Future]:
+        """
+        Adds updates for several keys to the next flush, counting as a single request for the interval
+
+        Returns the future of each key, resolved once this key is flushed
+        """
+        futures: Dict[Hashable, asyncio.Future] = {}
+
+        for key, payload in updates:
+            if self._merge and key in self.pending:
+                payload = self._merge(self.pending[key], payload)
+
+            self.pending[key] = payload
+
+            if key not in self._futures:
+                self._futures[key] = asyncio.get_running_loop().create_future()
+
+            futures[key] = self._futures[key]
+
+        if not futures:
+            return futures
+
+        self._triggers.append(time.monotonic())
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(self.interval))
+
+        return futures
+
+    async def _flush_after(self, interval: float):
+        await asyncio.sleep(interval)
+
+        # Updates scheduled from now on will go to the next flush
+        pending, self.pending = self.pending, {}
+        futures, self._futures = self._futures, {}
+        self._flush_task = None
+
+        # Keys are flushed concurrently so an update never waits behind unrelated ones
+        await asyncio.gather(
+            *(
+                self._flush_key(key, payload, futures[key])
+                for key, payload in pending.items()
+            )
+        )
+
+    async def _flush_key(self, key: Hashable, payload: Any, future: asyncio.Future):
+        try:
+            await self._flush(key, payload)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
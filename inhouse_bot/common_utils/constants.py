@@ -6,9 +6,10 @@ PREFIX = os.environ.get("INHOUSE_BOT_COMMAND_PREFIX") or "!"
 
 # 12pm UTC is 5am PT
 QUEUE_RESET_TIME = os.environ.get("QUEUE_RESET_TIME") or "12:00"
+QUEUE_RESET_H, QUEUE_RESET_M = map(int, QUEUE_RESET_TIME.split(":"))
 
 # How frequent the background jobs task is executed -- in seconds
-BACKGROUND_JOBS_INTERVAL = os.environ.get("BACKGROUND_JOBS_INTERVAL") or 60
+BACKGROUND_JOBS_INTERVAL = int(os.environ.get("BACKGROUND_JOBS_INTERVAL") or 60)
 
 # tournaments
 INHOUSE_BOT_TOURNAMENTS = bool(os.environ.get("INHOUSE_BOT_TOURNAMENTS"))
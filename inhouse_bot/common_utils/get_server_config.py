@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 from inhouse_bot.common_utils.constants import CONFIG_OPTIONS
 from inhouse_bot.database_orm import ServerConfig
 from inhouse_bot.database_orm.session.session import session_scope
@@ -33,3 +33,28 @@ def get_server_config_by_key(server_id: int, key: str) -> bool:
     with session_scope() as session:
         server_config = get_server_config(server_id=server_id, session=session)
         return server_config.config.get(key, False)
+
+
+def get_server_configs_bulk(
+    server_ids: List[int], keys: List[str]
+) -> Dict[Tuple[int, str], bool]:
+    """
+    Reads the given keys for all the given servers in a single query, returned as (server_id, key) -> value
+
+    Like get_server_config_by_key, servers or keys that don't yet exist in the config will return False.
+    """
+
+    with session_scope() as session:
+        server_configs = (
+            session.query(ServerConfig.server_id, ServerConfig.config)
+            .filter(ServerConfig.server_id.in_(server_ids))
+            .all()
+        )
+
+    configs = {server_id: config for (server_id, config) in server_configs}
+
+    return {
+        (server_id, key): (configs.get(server_id) or {}).get(key, False)
+        for server_id in server_ids
+        for key in keys
+    }
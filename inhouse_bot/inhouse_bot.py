@@ -1,27 +1,32 @@
+import asyncio
 import logging
-import threading
+from typing import Callable, Final
 
 from datetime import datetime
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ext.commands import NoPrivateMessage
 
 from fastapi import FastAPI
 
 from inhouse_bot import game_queue
+from inhouse_bot.cogs.admin_cog import AdminCog
+from inhouse_bot.cogs.queue_cog import QueueCog
+from inhouse_bot.cogs.stats_cog import StatsCog
 from inhouse_bot.common_utils.constants import (
     INHOUSE_BOT_TEST,
     INHOUSE_BOT_TOKEN,
     INHOUSE_BOT_TOURNAMENTS,
     PREFIX,
     BACKGROUND_JOBS_INTERVAL,
-    QUEUE_RESET_TIME,
+    QUEUE_RESET_H,
+    QUEUE_RESET_M,
     VERSION,
 )
 from inhouse_bot.common_utils.docstring import doc
 from inhouse_bot.common_utils.get_server_config import (
-    get_server_config_by_key,
+    get_server_configs_bulk,
 )
 from inhouse_bot.common_utils.is_admin import AdminGroupOnly
 from inhouse_bot.database_orm import session_scope
@@ -31,14 +36,80 @@ from inhouse_bot.queue_channel_handler.queue_channel_handler import (
     queue_channel_handler,
 )
 from inhouse_bot.tournament import tournament_handler, tournament_check
-
-# Defining intents to get full members list
 from inhouse_bot.ranking_channel_handler.ranking_channel_handler import (
     ranking_channel_handler,
 )
 
-intents = discord.Intents.all()
-intents.presences = False
+# User-facing error responses, built once as they only depend on import-time constants
+_NO_PM_MSG: Final[str] = "This command can only be used inside a server"
+_QUEUE_ONLY_MSG: Final[
+    str
+] = "This command can only be used in a channel marked as a queue by an admin"
+_SAME_ROLES_MSG: Final[str] = "Duos must have different roles"
+_ADMIN_ONLY_MSG: Final[str] = "Only admins can use this command"
+
+_PLAYER_IN_GAME_MSG: Final[str] = (
+    "Your last game was not scored and you are not allowed to queue at the moment.\n"
+    + (
+        "The game will automatically be scored shortly after it ends, "
+        if INHOUSE_BOT_TOURNAMENTS
+        else f"One of the winners can score the game with `{PREFIX}won`, "
+    )
+    + f"or players can agree to cancel it with `{PREFIX}cancel`"
+)
+
+_PLAYER_IN_READY_CHECK_MSG: Final[str] = (
+    "A game has already been found for you and you cannot queue until it is accepted or cancelled\n"
+    f"If it is a bug, post in #inhouse and ask them to use `{PREFIX}admin reset` with your name"
+)
+
+_GENERIC_ERROR_MSG: Final[str] = (
+    "There was an error processing the command\n"
+    f"Use {PREFIX}help for the commands list or post in #inhouse for bugs"
+)
+
+
+def _command_not_found_msg(invoked_with: str) -> str:
+    return (
+        f"Command `{invoked_with}` not found, use {PREFIX}help to see the commands list"
+    )
+
+
+def _missing_argument_msg(invoked_with: str) -> str:
+    return f"Arguments missing, use `{PREFIX}help {invoked_with}` to see the arguments list"
+
+
+# Error class -> user-facing response, or function building it from the invoked command name
+# A None response means the error is silently ignored
+_ERROR_RESPONSES: dict[type, str | Callable[[str], str] | None] = {
+    commands.CommandNotFound: _command_not_found_msg,
+    commands.MissingRequiredArgument: _missing_argument_msg,
+    # Conversion errors feedback are handled in my converters
+    commands.ConversionError: None,
+    NoPrivateMessage: _NO_PM_MSG,
+    QueueChannelsOnly: _QUEUE_ONLY_MSG,
+    SameRolesForDuo: _SAME_ROLES_MSG,
+    AdminGroupOnly: _ADMIN_ONLY_MSG,
+}
+
+# Original error class -> user-facing response, for errors raised during a command
+_COMMAND_INVOKE_ERROR_RESPONSES: dict[type, str] = {
+    game_queue.PlayerInGame: _PLAYER_IN_GAME_MSG,
+    game_queue.PlayerInReadyCheck: _PLAYER_IN_READY_CHECK_MSG,
+}
+
+# Only requesting the gateway events the bot uses
+intents = discord.Intents.none()
+intents.guilds = True
+# Members list, used for member converters and voice channel permissions
+intents.members = True
+# Prefix commands and queue channels purging
+intents.messages = True
+intents.message_content = True
+# Validation dialogs and stats menus
+intents.reactions = True
+# Champion emojis lookup
+intents.emojis_and_stickers = True
 
 
 class InhouseBot(commands.Bot):
@@ -53,7 +124,21 @@ class InhouseBot(commands.Bot):
         super().__init__(PREFIX, intents=intents, case_insensitive=True, **options)
         self.app = app
 
+        # Running tournament check, and whether another one was requested while it was running
+        self._tournament_check_inflight: asyncio.Task | None = None
+        self._tournament_check_pending: bool = False
+
+        # Day ordinal of the last queue reset, to only reset once in the matching minute
+        self._last_reset_day: int | None = None
+
+        # IDs of the servers the bot is in, refreshed when it joins or leaves one
+        self._guild_ids: tuple[int, ...] = ()
+
+        # Whether the startup routine already ran, as on_ready also fires on every reconnection
+        self._startup_done: bool = False
+
         # Setting up the on_message listener that will handle queue channels
+        # It returns right away for other channels, using the handler's set of queue channel IDs
         self.add_listener(
             queue_channel_handler.queue_channel_message_listener, "on_message"
         )
@@ -61,11 +146,6 @@ class InhouseBot(commands.Bot):
         self.add_listener(self.command_logging, "on_command")
 
     async def setup_hook(self) -> None:
-        # Importing locally to allow InhouseBot to be imported in the cogs
-        from inhouse_bot.cogs.queue_cog import QueueCog
-        from inhouse_bot.cogs.admin_cog import AdminCog
-        from inhouse_bot.cogs.stats_cog import StatsCog
-
         if INHOUSE_BOT_TOURNAMENTS:
             await tournament_handler.setup(bot=self, app=self.app)
 
@@ -95,126 +175,175 @@ class InhouseBot(commands.Bot):
         Listener called on command-trigger messages to add some logging
         """
         logging.info(
-            f"{ctx.message.content}\t{ctx.author.name}\t{ctx.guild.name}\t{ctx.channel.name}"
+            "%s\t%s\t%s\t%s",
+            ctx.message.content,
+            ctx.author.name,
+            ctx.guild.name,
+            ctx.channel.name,
         )
 
-    def background_jobs(self):
+    def maybe_run_tournament_check(self):
         """
-        Triggers background jobs and sets a timer to execute them again on a timeout.
-        No work should be done in this thread -- jobs should only get added to the event loop
+        Starts a tournament check unless one is already running, in which case a single follow-up check is queued
         """
+        if (
+            self._tournament_check_inflight
+            and not self._tournament_check_inflight.done()
+        ):
+            self._tournament_check_pending = True
+            return
+
+        self._tournament_check_pending = False
+
+        self._tournament_check_inflight = self.loop.create_task(
+            self.check_all_tournaments()
+        )
+        self._tournament_check_inflight.add_done_callback(
+            self._on_tournament_check_done
+        )
+
+    def _on_tournament_check_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logging.error("error %s", task.exception())
+
+        if self._tournament_check_pending:
+            self.maybe_run_tournament_check()
+
+    async def check_all_tournaments(self):
+        """
+        Runs the tournament check for all servers concurrently
+        """
+        server_ids = self._guild_ids
+
+        results = await asyncio.gather(
+            *(
+                tournament_check(bot=self, server_id=server_id)
+                for server_id in server_ids
+            ),
+            return_exceptions=True,
+        )
+
+        for server_id, result in zip(server_ids, results):
+            if isinstance(result, Exception):
+                logging.error("error in server %s: %s", server_id, result)
+
+    @tasks.loop(seconds=BACKGROUND_JOBS_INTERVAL)
+    async def background_jobs(self):
+        """
+        Runs the background jobs every BACKGROUND_JOBS_INTERVAL seconds on the event loop
+        """
+        # Happens while the bot is not in any server
+        if not self._guild_ids:
+            return
+
         now = datetime.now()
 
         try:
-            queue_reset = get_server_config_by_key(
-                server_id=self.guilds[0].id, key="queue_reset"
-            )
-
-            if now.strftime("%H:%M") == QUEUE_RESET_TIME:
-                if queue_reset:
-                    game_queue.reset_queue()
-                    self.loop.create_task(
-                        queue_channel_handler.update_queue_channels(
-                            bot=self, server_id=None
+            if (
+                now.hour == QUEUE_RESET_H
+                and now.minute == QUEUE_RESET_M
+                and now.toordinal() != self._last_reset_day
+            ):
+                configs = get_server_configs_bulk(
+                    server_ids=list(self._guild_ids), keys=["queue_reset"]
+                )
+
+                for server_id in self._guild_ids:
+                    if configs[(server_id, "queue_reset")]:
+                        for channel_id in queue_channel_handler.get_server_queues(
+                            server_id
+                        ):
+                            game_queue.reset_queue(channel_id)
+
+                        await queue_channel_handler.update_queue_channels(
+                            bot=self, server_id=server_id
                         )
-                    )
+
+                # Only recorded once the reset went through, so a failure is retried on the next tick
+                self._last_reset_day = now.toordinal()
 
             # Check for completed matches once every 5 job cycles
             if INHOUSE_BOT_TOURNAMENTS and self.job_counter % 5 == 0:
-                # TODO this is only checking the first server, but it should check all servers
-                self.loop.create_task(
-                    tournament_check(bot=self, server_id=self.guilds[0].id)
-                )
+                self.maybe_run_tournament_check()
         except Exception as e:
-            logging.error(f"error {e}")
+            logging.error("error %s", e)
         finally:
             self.job_counter += 1
-            # Always make sure the next jobs are scheduled
-            threading.Timer(BACKGROUND_JOBS_INTERVAL, self.background_jobs).start()
 
-    async def on_ready(self):
-        logging.info(f"{self.user.name} has connected to Discord")
+    @background_jobs.before_loop
+    async def before_background_jobs(self):
+        await self.wait_until_ready()
 
-        # We cancel all ready-checks, and queue_channel_handler will handle rewriting the queues
-        game_queue.cancel_all_ready_checks()
+    def refresh_guild_ids(self):
+        self._guild_ids = tuple(guild.id for guild in self.guilds)
 
-        await queue_channel_handler.update_queue_channels(bot=self, server_id=None)
-        await ranking_channel_handler.update_ranking_channels(bot=self, server_id=None)
+    async def on_ready(self):
+        logging.info("%s has connected to Discord", self.user.name)
 
-        # Starts the scheduler
-        self.background_jobs()
+        self.refresh_guild_ids()
 
-    async def on_command_error(self, ctx, error):
-        """
-        Custom error command that catches CommandNotFound as well as MissingRequiredArgument for readable feedback
-        """
-        if isinstance(error, commands.CommandNotFound):
-            await ctx.send(
-                f"Command `{ctx.invoked_with}` not found, use {PREFIX}help to see the commands list"
-            )
+        # Starts the scheduler, unless this is a reconnection and it is already running
+        if not self.background_jobs.is_running():
+            self.background_jobs.start()
 
-        elif isinstance(error, commands.MissingRequiredArgument):
-            await ctx.send(
-                f"Arguments missing, use `{PREFIX}help {ctx.invoked_with}` to see the arguments list"
-            )
+        # After a reconnection, ongoing ready-checks are still alive and the queues do not need a restart message
+        if self._startup_done:
+            return
 
-        elif isinstance(error, commands.ConversionError):
-            # Conversion errors feedback are handled in my converters
-            pass
+        self._startup_done = True
 
-        elif isinstance(error, NoPrivateMessage):
-            await ctx.send(f"This command can only be used inside a server")
+        # We cancel all ready-checks, and queue_channel_handler will handle rewriting the queues
+        game_queue.cancel_all_ready_checks()
 
-        elif isinstance(error, QueueChannelsOnly):
-            await ctx.send(
-                f"This command can only be used in a channel marked as a queue by an admin"
-            )
+        # Queue and ranking channels are distinct, so we can update them concurrently
+        results = await asyncio.gather(
+            queue_channel_handler.update_queue_channels(bot=self, server_id=None),
+            ranking_channel_handler.update_ranking_channels(bot=self, server_id=None),
+            return_exceptions=True,
+        )
+
+        for channels_type, result in zip(("queue", "ranking"), results):
+            if isinstance(result, Exception):
+                logging.error("error updating %s channels: %s", channels_type, result)
 
-        elif isinstance(error, SameRolesForDuo):
-            await ctx.send(f"Duos must have different roles")
+    async def on_guild_join(self, guild: discord.Guild):
+        self.refresh_guild_ids()
 
-        elif isinstance(error, AdminGroupOnly):
-            await ctx.send(f"Only admins can use this command")
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.refresh_guild_ids()
 
+    async def on_command_error(self, ctx, error):
+        """
+        Custom error command that catches CommandNotFound as well as MissingRequiredArgument for readable feedback
+        """
         # This handles errors that happen during a command
-        elif isinstance(error, commands.CommandInvokeError):
+        if isinstance(error, commands.CommandInvokeError):
             og_error = error.original
 
-            if isinstance(og_error, game_queue.PlayerInGame):
-                await ctx.send(
-                    (
-                        f"Your last game was not scored and you are not allowed to queue at the moment.\n"
-                        + (
-                            f"The game will automatically be scored shortly after it ends, "
-                            if INHOUSE_BOT_TOURNAMENTS
-                            else f"One of the winners can score the game with `{PREFIX}won`, "
-                        )
-                        + f"or players can agree to cancel it with `{PREFIX}cancel`"
-                    ),
-                    delete_after=20,
-                )
+            for error_class in type(og_error).__mro__:
+                if error_class in _COMMAND_INVOKE_ERROR_RESPONSES:
+                    await ctx.send(
+                        _COMMAND_INVOKE_ERROR_RESPONSES[error_class], delete_after=20
+                    )
+                    return
 
-            elif isinstance(og_error, game_queue.PlayerInReadyCheck):
-                await ctx.send(
-                    f"A game has already been found for you and you cannot queue until it is accepted or cancelled\n"
-                    f"If it is a bug, post in #inhouse and ask them to use `{PREFIX}admin reset` with your name",
-                    delete_after=20,
-                )
+            # User-facing error
+            await ctx.send(_GENERIC_ERROR_MSG)
 
-            else:
-                # User-facing error
-                await ctx.send(
-                    f"There was an error processing the command\n"
-                    f"Use {PREFIX}help for the commands list or post in #inhouse for bugs",
-                )
+            logging.error(og_error)
+            return
 
-                logging.error(og_error)
+        for error_class in type(error).__mro__:
+            if error_class in _ERROR_RESPONSES:
+                response = _ERROR_RESPONSES[error_class]
 
-        else:
-            # User-facing error
-            await ctx.send(
-                f"There was an error processing the command\n"
-                f"Use {PREFIX}help for the commands list or post in #inhouse for bugs",
-            )
+                if callable(response):
+                    await ctx.send(response(ctx.invoked_with))
+                elif response is not None:
+                    await ctx.send(response)
+                return
+
+        # User-facing error
+        await ctx.send(_GENERIC_ERROR_MSG)
 
-            logging.error(error)
+        logging.error(error)
@@ -1,12 +1,15 @@
 import asyncio
 import logging
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Tuple
 
 from discord import Message, Embed, TextChannel
 from discord.ext import commands
 from discord.ext.commands import Bot
 
 from inhouse_bot import game_queue
+from inhouse_bot.common_utils.batched_update_aggregator import (
+    BatchedUpdateAggregator,
+)
 from inhouse_bot.common_utils.constants import PREFIX
 from inhouse_bot.common_utils.embeds import embeds_color
 from inhouse_bot.common_utils.emoji_and_thumbnails import get_role_emoji
@@ -25,6 +28,11 @@ class QueueChannelHandler:
                 .all()
             )
 
+        # Queue channel IDs, checked on every message
+        self._queue_channel_ids: FrozenSet[int] = frozenset(
+            c.id for c in self._queue_channels
+        )
+
         # channel_id -> GameQueue
         self._queue_cache = {}
 
@@ -37,12 +45,18 @@ class QueueChannelHandler:
         # Guarantees we do not purge too fast
         self.latest_purge_message_id = {}
 
+        # Coalesces queue refreshes requested at the same time into one refresh per channel
+        self._update_aggregator = BatchedUpdateAggregator(
+            flush=self._flush_channel_update,
+            merge=lambda pending, new: (new[0], pending[1] or new[1]),
+        )
+
     async def queue_channel_message_listener(self, msg: Message):
         """
         This is a listener that’s meant to be called on all messages and delete unnecessary ones in the queue channels
         """
 
-        # We check if the message is in a queue channel
+        # We check if the message is in a queue channel, which is a set lookup as this runs on every message
         if self.is_queue_channel(msg.channel.id):
 
             # If it was, we trigger a purge of non-marked messages
@@ -134,7 +148,7 @@ class QueueChannelHandler:
         return [c.id for c in self._queue_channels if c.server_id == server_id]
 
     def is_queue_channel(self, channel_id) -> bool:
-        return channel_id in self.queue_channel_ids
+        return channel_id in self._queue_channel_ids
 
     def is_not_queue_related_message(self, msg: Message) -> bool:
         return (msg.id not in self.permanent_messages) and (
@@ -155,6 +169,7 @@ class QueueChannelHandler:
         with session_scope() as session:
             session.merge(channel)
         self._queue_channels.append(channel)
+        self._queue_channel_ids = self._queue_channel_ids | {channel_id}
 
     def unmark_queue_channel(self, channel_id):
         game_queue.reset_queue(channel_id)
@@ -166,6 +181,7 @@ class QueueChannelHandler:
             channel_query.delete(synchronize_session=False)
 
         self._queue_channels = [c for c in self._queue_channels if c.id != channel_id]
+        self._queue_channel_ids = self._queue_channel_ids - {channel_id}
 
         logging.info(f"Unmarked {channel_id} as a queue channel")
 
@@ -189,6 +205,8 @@ class QueueChannelHandler:
             restart = False
             channels_to_check = self.get_server_queues(server_id)
 
+        updates: List[Tuple[int, Tuple[TextChannel, bool]]] = []
+
         for channel_id in channels_to_check:
             channel = bot.get_channel(channel_id)
 
@@ -197,7 +215,19 @@ class QueueChannelHandler:
                 continue
 
             if isinstance(channel, TextChannel):
-                await self.refresh_channel_queue(channel=channel, restart=restart)
+                updates.append((channel_id, (channel, restart)))
+
+        # All our channels count as a single update request for the aggregator
+        flushes = self._update_aggregator.schedule_many(updates).values()
+
+        # We wait for the refreshes of our channels, which raises if one of them failed
+        await asyncio.gather(*(asyncio.shield(flush) for flush in flushes))
+
+    async def _flush_channel_update(
+        self, channel_id: int, payload: Tuple[TextChannel, bool]
+    ):
+        channel, restart = payload
+        await self.refresh_channel_queue(channel=channel, restart=restart)
 
 
 # This will be an object common to all functions afterwards
@@ -211,7 +241,7 @@ class QueueChannelsOnly(commands.CheckFailure):
 # This is a decorator for commands
 def queue_channel_only():
     async def predicate(ctx: commands.Context):
-        if ctx.channel.id not in queue_channel_handler.queue_channel_ids:
+        if not queue_channel_handler.is_queue_channel(ctx.channel.id):
             raise QueueChannelsOnly
         else:
             return True
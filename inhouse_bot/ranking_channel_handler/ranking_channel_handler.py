@@ -1,10 +1,14 @@
-from typing import Optional, List
+import asyncio
+from typing import Optional, List, Tuple
 
 import sqlalchemy
 from discord import TextChannel
 from discord.ext.commands import Bot
 from sqlalchemy import func
 
+from inhouse_bot.common_utils.batched_update_aggregator import (
+    BatchedUpdateAggregator,
+)
 from inhouse_bot.database_orm import (
     ChannelInformation,
     session_scope,
@@ -26,6 +30,11 @@ class RankingChannelHandler:
                 .all()
             )
 
+        # Coalesces ranking refreshes requested at the same time into one refresh per channel
+        self._update_aggregator = BatchedUpdateAggregator(
+            flush=lambda channel_id, channel: self.refresh_channel_rankings(channel)
+        )
+
     @property
     def ranking_channel_ids(self) -> List[int]:
         return [c.id for c in self._ranking_channels]
@@ -70,6 +79,8 @@ class RankingChannelHandler:
         else:
             channels_to_update = self.get_server_ranking_channels(server_id)
 
+        updates: List[Tuple[int, TextChannel]] = []
+
         for channel_id in channels_to_update:
             channel = bot.get_channel(channel_id)
 
@@ -78,7 +89,13 @@ class RankingChannelHandler:
                 continue
 
             if isinstance(channel, TextChannel):
-                await self.refresh_channel_rankings(channel=channel)
+                updates.append((channel_id, channel))
+
+        # All our channels count as a single update request for the aggregator
+        flushes = self._update_aggregator.schedule_many(updates).values()
+
+        # We wait for the refreshes of our channels, which raises if one of them failed
+        await asyncio.gather(*(asyncio.shield(flush) for flush in flushes))
 
     async def refresh_channel_rankings(self, channel: TextChannel):
         ratings = self.get_server_ratings(channel.guild.id, limit=30)
@@ -15,11 +15,12 @@ from inhouse_bot.database_orm.tables.tournament import Tournament
 from inhouse_bot.tournament.tournament_handler import tournament_handler
 
 
-def get_active_games(session: Session) -> List[Tuple[Game, Tournament]]:
+def get_active_games(session: Session, server_id: int) -> List[Tuple[Game, Tournament]]:
     return (
         session.query(Game, Tournament)
         .select_from(Game)
         .outerjoin(Tournament)
+        .filter(Game.server_id == server_id)
         .filter(Game.winner == None)
         .all()
     )
@@ -27,14 +28,14 @@ def get_active_games(session: Session) -> List[Tuple[Game, Tournament]]:
 
 async def tournament_check(bot: commands.Bot, server_id: int):
     """
-    Tournaments background job. This looks at the active games and tries to find a completed tournament match
+    Tournaments background job. This looks at the server's active games and tries to find a completed tournament match
     """
 
-    logging.info("Checking for completed matches")
+    logging.info("Checking for completed matches in server %s", server_id)
     with session_scope() as session:
 
         # query for tournaments whose games do not have a winner
-        for (game, tournament) in get_active_games(session):
+        for (game, tournament) in get_active_games(session, server_id):
             logging.info(f"Game {game.id} is still active. Checking for updates.")
 
             start_timestamp = int(game.start.timestamp())
@@ -1,31 +1,58 @@
 import uvicorn
 import logging
+import logging.handlers
 import asyncio
+import queue
+import signal
 from inhouse_bot.common_utils.constants import INHOUSE_BOT_TOURNAMENTS, PORT
 from inhouse_bot.inhouse_bot import InhouseBot
 from fastapi import FastAPI
 
-logging.basicConfig(
-    format="%(asctime)s %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s",
-    datefmt="%Y-%m-%d:%H:%M:%S%z",
-    level=logging.INFO,
-)
+
+def stop_on_sigterm(signum, frame):
+    # Raising lets the finally clause below flush the logs when the container is stopped
+    raise SystemExit(0)
+
 
 if __name__ == "__main__":
-    # Prepare bot
-    app = FastAPI()
-    bot = InhouseBot(app)
-
-    if INHOUSE_BOT_TOURNAMENTS:
-        # TODO configure any settings/logging
-
-        @app.on_event("startup")
-        async def startup_event():
-            # Run the Discord bot on server startup
-            asyncio.create_task(bot.start())
-
-        # TODO uvicorn emits logs that are logged twice
-        uvicorn.run(app, host="0.0.0.0", port=PORT, log_level=logging.INFO)
-    else:
-        # Run the bot without starting the API (no tournaments)
-        asyncio.run(bot.start())
+    # Log records are only put in a queue on the event loop, and written to stderr by the listener thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(
+        logging.Formatter(
+            fmt="%(asctime)s %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s",
+            datefmt="%Y-%m-%d:%H:%M:%S%z",
+        )
+    )
+    log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+
+    logging.basicConfig(
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        level=logging.INFO,
+    )
+    log_listener.start()
+
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+
+    try:
+        # Prepare bot
+        app = FastAPI()
+        bot = InhouseBot(app)
+
+        if INHOUSE_BOT_TOURNAMENTS:
+            # TODO configure any settings/logging
+
+            @app.on_event("startup")
+            async def startup_event():
+                # Run the Discord bot on server startup
+                asyncio.create_task(bot.start())
+
+            # TODO uvicorn emits logs that are logged twice
+            uvicorn.run(app, host="0.0.0.0", port=PORT, log_level=logging.INFO)
+        else:
+            # Run the bot without starting the API (no tournaments)
+            asyncio.run(bot.start())
+    finally:
+        # Flushes the remaining log records
+        log_listener.stop()
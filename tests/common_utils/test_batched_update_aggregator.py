@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from inhouse_bot.common_utils.batched_update_aggregator import (
+    MIN_INTERVAL,
+    BatchedUpdateAggregator,
+)
+
+
+@pytest.mark.asyncio
+async def test_updates_coalesced():
+    flushed = []
+
+    async def flush(key, payload):
+        flushed.append((key, payload))
+
+    aggregator = BatchedUpdateAggregator(flush=flush)
+
+    first_flush = aggregator.schedule(0, "first")
+    other_flush = aggregator.schedule(1, "other")
+    latest_flush = aggregator.schedule(0, "latest")
+
+    # Requests for the same key share the same flush
+    assert first_flush is latest_flush
+    assert first_flush is not other_flush
+
+    await asyncio.gather(first_flush, other_flush)
+
+    assert sorted(flushed) == [(0, "latest"), (1, "other")]
+    assert not aggregator.pending
+
+
+@pytest.mark.asyncio
+async def test_updates_merged():
+    flushed = []
+
+    async def flush(key, payload):
+        flushed.append((key, payload))
+
+    aggregator = BatchedUpdateAggregator(flush=flush, merge=lambda a, b: a + b)
+
+    aggregator.schedule(0, 1)
+    await aggregator.schedule(0, 2)
+
+    assert flushed == [(0, 3)]
+
+
+@pytest.mark.asyncio
+async def test_flush_error_raised_for_its_key_only():
+    async def flush(key, payload):
+        if key == 0:
+            raise ValueError(payload)
+
+    aggregator = BatchedUpdateAggregator(flush=flush)
+
+    failing_flush = aggregator.schedule(0, "failing")
+    other_flush = aggregator.schedule(1, "other")
+
+    with pytest.raises(ValueError):
+        await failing_flush
+
+    await other_flush
+
+
+@pytest.mark.asyncio
+async def test_interval_grows_with_load():
+    async def flush(key, payload):
+        pass
+
+    aggregator = BatchedUpdateAggregator(flush=flush)
+    idle_interval = aggregator.interval
+
+    flushes = [aggregator.schedule(i, None) for i in range(0, 20)]
+
+    assert aggregator.interval > idle_interval
+
+    await asyncio.gather(*flushes)
+
+
+@pytest.mark.asyncio
+async def test_schedule_many_counts_as_one_request():
+    async def flush(key, payload):
+        pass
+
+    aggregator = BatchedUpdateAggregator(flush=flush)
+
+    flushes = aggregator.schedule_many((i, None) for i in range(0, 20))
+
+    assert len(flushes) == 20
+    assert aggregator.interval == MIN_INTERVAL
+
+    await asyncio.gather(*flushes.values())
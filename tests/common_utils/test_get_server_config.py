@@ -0,0 +1,31 @@
+from inhouse_bot.common_utils.get_server_config import get_server_configs_bulk
+from inhouse_bot.database_orm import session_scope, ServerConfig
+
+CONFIGURED_SERVER_ID = 1001
+UNCONFIGURED_SERVER_ID = 1002
+
+
+def test_get_server_configs_bulk():
+    with session_scope() as session:
+        session.query(ServerConfig).filter(
+            ServerConfig.server_id.in_([CONFIGURED_SERVER_ID, UNCONFIGURED_SERVER_ID])
+        ).delete(synchronize_session=False)
+
+        session.add(
+            ServerConfig(server_id=CONFIGURED_SERVER_ID, config={"queue_reset": True})
+        )
+
+    configs = get_server_configs_bulk(
+        server_ids=[CONFIGURED_SERVER_ID, UNCONFIGURED_SERVER_ID],
+        keys=["queue_reset", "voice"],
+    )
+
+    # Keys present in the config return their stored value
+    assert configs[(CONFIGURED_SERVER_ID, "queue_reset")] is True
+
+    # Keys missing from an existing config return False
+    assert configs[(CONFIGURED_SERVER_ID, "voice")] is False
+
+    # Servers without a config return False
+    assert configs[(UNCONFIGURED_SERVER_ID, "queue_reset")] is False
+    assert configs[(UNCONFIGURED_SERVER_ID, "voice")] is False